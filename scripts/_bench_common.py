@@ -0,0 +1,138 @@
+"""
+Shared helpers for the Criterion benchmark scripts
+
+Used by analyze-benchmarks.py and visualize-benchmarks.py, which import it
+from their own directory (sys.path[0] when either script is run).
+"""
+
+import importlib
+import os
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, List, Optional, Tuple
+
+# (mean, std_dev, median) point estimates in nanoseconds
+Estimates = Tuple[float, float, float]
+
+# Parse serially below this many files. Measured per file: ~12 µs to read
+# and decode serially; threads are ~2x slower at every size (decoding holds
+# the GIL); a fork-based process pool adds ~10 ms start-up plus ~3.5 µs of
+# IPC. With two workers that only breaks even around 4000 files, and spawn
+# or forkserver start-up (~200-300 ms) never pays off at realistic sizes.
+PARALLEL_PARSE_THRESHOLD = 5000
+
+# Extracts the estimate objects needed from a parsed estimates.json
+ESTIMATE_FIELDS = itemgetter("mean", "std_dev", "median")
+
+# Unit boundaries in nanoseconds, with the divisor and suffix for each unit
+TIME_UNIT_BOUNDS = (1e3, 1e6, 1e9)
+TIME_UNIT_SCALES = (1.0, 1e3, 1e6, 1e9)
+TIME_UNIT_SUFFIXES = ("ns", "µs", "ms", "s")
+
+
+@lru_cache(maxsize=None)
+def optional_import(name: str):
+    """Import an optional accelerator module on first use, or return None"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def load_json(raw: bytes):
+    """Decode JSON bytes, using orjson when available"""
+    orjson = optional_import("orjson")
+    if orjson is not None:
+        return orjson.loads(raw)
+    
+    import json
+    return json.loads(raw)
+
+
+def dump_json(data) -> bytes:
+    """Encode JSON as compact UTF-8 bytes, using orjson when available"""
+    orjson = optional_import("orjson")
+    if orjson is not None:
+        return orjson.dumps(data)
+    
+    import json
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def decode_estimates(raw: bytes, source: str) -> Optional[Estimates]:
+    """
+    Extract point estimates from the contents of a Criterion estimates.json
+    
+    Args:
+        raw: File contents
+        source: Path used in the warning printed on failure
+    
+    Returns:
+        (mean, std_dev, median) tuple, or None if unparseable
+    """
+    try:
+        data = load_json(raw)
+        
+        # Extract mean, std_dev and median point estimates
+        mean_est, std_dev_est, median_est = ESTIMATE_FIELDS(data)
+        mean = mean_est["point_estimate"]
+        std_dev = std_dev_est["point_estimate"]
+        median = median_est["point_estimate"]
+    except (KeyError, TypeError, ValueError) as e:  # JSONDecodeError is a ValueError
+        print(f"Warning: Failed to parse {source}: {e}", file=sys.stderr)
+        return None
+    
+    return mean, std_dev, median
+
+
+def parse_all(
+    parse: Callable[[str], Optional[Estimates]],
+    paths: List[str]
+) -> List[Optional[Estimates]]:
+    """
+    Apply a module-level parse function to every path, preserving order
+    
+    Files are parsed serially unless there are at least
+    PARALLEL_PARSE_THRESHOLD of them, more than one CPU, and fork is the
+    effective multiprocessing start method; only then is a fork-based
+    process pool used. Fork is the default only on Linux before Python
+    3.14 (3.14 switched to forkserver, macOS and Windows use spawn), so
+    elsewhere large trees are parsed serially too unless the application
+    has selected fork itself.
+    
+    Args:
+        parse: Picklable function mapping one path to its estimates
+        paths: Paths to parse
+    
+    Returns:
+        Parse results aligned with paths
+    """
+    if len(paths) < PARALLEL_PARSE_THRESHOLD or (os.cpu_count() or 1) < 2:
+        return [parse(path) for path in paths]
+    
+    import multiprocessing
+    
+    # allow_none avoids fixing the start method for the whole process; the
+    # first entry of get_all_start_methods() is the platform default
+    start_method = multiprocessing.get_start_method(allow_none=True)
+    if start_method is None:
+        start_method = multiprocessing.get_all_start_methods()[0]
+    if start_method != "fork":
+        return [parse(path) for path in paths]
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = os.cpu_count()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        return list(executor.map(parse, paths, chunksize=max(16, len(paths) // (workers * 4))))
+
+
+def format_time(nanoseconds: float) -> str:
+    """Format time in appropriate unit"""
+    unit = bisect_right(TIME_UNIT_BOUNDS, nanoseconds)
+    return f"{nanoseconds / TIME_UNIT_SCALES[unit]:.2f} {TIME_UNIT_SUFFIXES[unit]}"
@@ -10,14 +10,20 @@ Usage:
 """
 
 import argparse
-import json
+import io
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from _bench_common import Estimates, decode_estimates, format_time, optional_import, parse_all
+
+# The optional accelerators (orjson, numpy, numba) are imported on first use
+# so that --help and argument errors do not pay for them.
+
 
 class ChangeType(Enum):
     """Type of performance change"""
@@ -28,7 +34,11 @@ class ChangeType(Enum):
     MISSING = "missing"
 
 
-@dataclass
+# Change types indexed by the codes produced when classifying changes
+CHANGE_CODES = (ChangeType.STABLE, ChangeType.REGRESSION, ChangeType.IMPROVEMENT)
+
+
+@dataclass(slots=True, frozen=True)
 class BenchmarkResult:
     """Benchmark result data"""
     name: str
@@ -38,7 +48,7 @@ class BenchmarkResult:
     unit: str = "ns"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Comparison:
     """Comparison between baseline and current"""
     name: str
@@ -48,6 +58,69 @@ class Comparison:
     change_type: ChangeType
 
 
+def _parse_estimates(bench_path: str) -> Optional[Estimates]:
+    """
+    Parse the Criterion estimates for a single benchmark directory
+    
+    Reads base/estimates.json, falling back to estimates.json directly
+    inside the benchmark directory.
+    
+    Args:
+        bench_path: Path to the benchmark directory
+        
+    Returns:
+        (mean, std_dev, median) tuple, or None if missing or unparseable
+    """
+    estimates_file = os.path.join(bench_path, "base", "estimates.json")
+    try:
+        f = open(estimates_file, 'rb')
+    except FileNotFoundError:
+        # Try without base subdirectory
+        estimates_file = os.path.join(bench_path, "estimates.json")
+        try:
+            f = open(estimates_file, 'rb')
+        except FileNotFoundError:
+            return None
+    
+    with f:
+        return decode_estimates(f.read(), estimates_file)
+
+
+def _classify(base_means, cur_means, threshold, change_out, code_out):
+    """
+    Classification kernel: fill change percentages and CHANGE_CODES indices
+    
+    Written as a flat indexed loop so it compiles under numba when available
+    and otherwise runs unchanged on plain lists. A zero baseline has no
+    relative change and is reported as a 0.0% stable result.
+    """
+    for i in range(len(base_means)):
+        base = base_means[i]
+        if base == 0.0:
+            change_out[i] = 0.0
+            code_out[i] = 0
+            continue
+        
+        change = ((cur_means[i] - base) / base) * 100.0
+        change_out[i] = change
+        
+        if abs(change) < threshold:
+            code_out[i] = 0
+        elif change > 0:
+            code_out[i] = 1
+        else:
+            code_out[i] = 2
+
+
+@lru_cache(maxsize=None)
+def _compiled_classify():
+    """Return _classify compiled with numba, or None if numba is unavailable"""
+    numba = optional_import("numba")
+    if numba is None:
+        return None
+    return numba.njit(cache=True)(_classify)
+
+
 class BenchmarkAnalyzer:
     """Analyzes benchmark results and detects regressions"""
 
@@ -75,35 +148,28 @@ class BenchmarkAnalyzer:
         if not criterion_dir.exists():
             return results
         
-        # Iterate through benchmark directories
-        for bench_dir in criterion_dir.iterdir():
-            if not bench_dir.is_dir():
+        # Collect benchmark directories; entries carry their file type, so
+        # no per-directory stat is needed
+        bench_names = []
+        bench_paths = []
+        with os.scandir(criterion_dir) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # Intern names so baseline and current results share keys
+                    bench_names.append(sys.intern(entry.name))
+                    bench_paths.append(entry.path)
+        
+        for name, estimates in zip(bench_names, parse_all(_parse_estimates, bench_paths)):
+            if estimates is None:
                 continue
             
-            # Look for estimates.json
-            estimates_file = bench_dir / "base" / "estimates.json"
-            if not estimates_file.exists():
-                # Try without base subdirectory
-                estimates_file = bench_dir / "estimates.json"
-            
-            if estimates_file.exists():
-                try:
-                    with open(estimates_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    # Extract mean and std_dev
-                    mean = data.get("mean", {}).get("point_estimate", 0)
-                    std_dev = data.get("std_dev", {}).get("point_estimate", 0)
-                    median = data.get("median", {}).get("point_estimate", 0)
-                    
-                    results[bench_dir.name] = BenchmarkResult(
-                        name=bench_dir.name,
-                        mean=mean,
-                        std_dev=std_dev,
-                        median=median
-                    )
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Warning: Failed to parse {estimates_file}: {e}", file=sys.stderr)
+            mean, std_dev, median = estimates
+            results[name] = BenchmarkResult(
+                name=name,
+                mean=mean,
+                std_dev=std_dev,
+                median=median
+            )
         
         return results
 
@@ -123,30 +189,28 @@ class BenchmarkAnalyzer:
             List of comparisons
         """
         comparisons = []
-        all_benchmarks = set(baseline.keys()) | set(current.keys())
+        all_benchmarks = sorted(set(baseline.keys()) | set(current.keys()))
+        
+        # Classify all benchmarks present on both sides in one batch
+        shared = [name for name in all_benchmarks if name in baseline and name in current]
+        changes, codes = self.classify_changes(
+            [baseline[name].mean for name in shared],
+            [current[name].mean for name in shared]
+        )
+        classified = dict(zip(shared, zip(changes, codes)))
         
-        for name in sorted(all_benchmarks):
+        for name in all_benchmarks:
             baseline_result = baseline.get(name)
             current_result = current.get(name)
             
             if baseline_result and current_result:
-                # Calculate percentage change
-                change = ((current_result.mean - baseline_result.mean) / baseline_result.mean) * 100
-                
-                # Determine change type
-                if abs(change) < self.threshold:
-                    change_type = ChangeType.STABLE
-                elif change > 0:
-                    change_type = ChangeType.REGRESSION
-                else:
-                    change_type = ChangeType.IMPROVEMENT
-                
+                change, code = classified[name]
                 comparisons.append(Comparison(
                     name=name,
                     baseline=baseline_result,
                     current=current_result,
                     change_percent=change,
-                    change_type=change_type
+                    change_type=CHANGE_CODES[code]
                 ))
             elif current_result:
                 # New benchmark
@@ -169,16 +233,58 @@ class BenchmarkAnalyzer:
         
         return comparisons
 
+    def classify_changes(
+        self,
+        baseline_means: List[float],
+        current_means: List[float]
+    ) -> Tuple[List[float], List[int]]:
+        """
+        Compute percentage changes and classify them against the threshold
+        
+        Args:
+            baseline_means: Baseline mean times
+            current_means: Current mean times, aligned with baseline_means
+            
+        Returns:
+            Tuple of (change percentages, CHANGE_CODES indices)
+        """
+        count = len(baseline_means)
+        if not count:
+            return [], []
+        
+        kernel = _compiled_classify()
+        np = optional_import("numpy")
+        
+        if kernel is not None and np is not None:
+            changes = np.empty(count, dtype=np.float64)
+            codes = np.empty(count, dtype=np.int8)
+            kernel(
+                np.asarray(baseline_means, dtype=np.float64),
+                np.asarray(current_means, dtype=np.float64),
+                float(self.threshold),
+                changes,
+                codes
+            )
+            return changes.tolist(), codes.tolist()
+        
+        if np is not None:
+            base = np.asarray(baseline_means, dtype=np.float64)
+            cur = np.asarray(current_means, dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = (cur - base) / base * 100
+            # Match _classify: a zero baseline is a 0.0% stable result
+            change = np.where(base == 0, 0.0, change)
+            codes = np.where(np.abs(change) < self.threshold, 0, np.where(change > 0, 1, 2))
+            return change.tolist(), codes.tolist()
+        
+        changes = [0.0] * count
+        codes = [0] * count
+        _classify(baseline_means, current_means, self.threshold, changes, codes)
+        return changes, codes
+
     def format_time(self, nanoseconds: float) -> str:
         """Format time in appropriate unit"""
-        if nanoseconds < 1000:
-            return f"{nanoseconds:.2f} ns"
-        elif nanoseconds < 1_000_000:
-            return f"{nanoseconds / 1000:.2f} µs"
-        elif nanoseconds < 1_000_000_000:
-            return f"{nanoseconds / 1_000_000:.2f} ms"
-        else:
-            return f"{nanoseconds / 1_000_000_000:.2f} s"
+        return format_time(nanoseconds)
 
     def print_report(self, comparisons: List[Comparison]) -> bool:
         """
@@ -197,67 +303,69 @@ class BenchmarkAnalyzer:
         new = [c for c in comparisons if c.change_type == ChangeType.NEW]
         missing = [c for c in comparisons if c.change_type == ChangeType.MISSING]
         
-        print("\n" + "=" * 80)
-        print("BENCHMARK REGRESSION ANALYSIS")
-        print("=" * 80)
+        # Build the whole report in memory and emit it with a single write
+        out = io.StringIO()
+        write = out.write
+        fmt = self.format_time
+        rule = "=" * 80 + "\n"
+        section_rule = "-" * 80 + "\n"
+        
+        write("\n" + rule)
+        write("BENCHMARK REGRESSION ANALYSIS\n")
+        write(rule)
         
         # Summary
-        print(f"\nSummary:")
-        print(f"  Total benchmarks:  {len(comparisons)}")
-        print(f"  Regressions:       {len(regressions)} ❌")
-        print(f"  Improvements:      {len(improvements)} ✅")
-        print(f"  Stable:            {len(stable)} ➖")
-        print(f"  New:               {len(new)} 🆕")
-        print(f"  Missing:           {len(missing)} ⚠️")
-        print(f"  Threshold:         ±{self.threshold}%")
+        write("\nSummary:\n")
+        write(f"  Total benchmarks:  {len(comparisons)}\n")
+        write(f"  Regressions:       {len(regressions)} ❌\n")
+        write(f"  Improvements:      {len(improvements)} ✅\n")
+        write(f"  Stable:            {len(stable)} ➖\n")
+        write(f"  New:               {len(new)} 🆕\n")
+        write(f"  Missing:           {len(missing)} ⚠️\n")
+        write(f"  Threshold:         ±{self.threshold}%\n")
         
         # Regressions
         if regressions:
-            print("\n" + "-" * 80)
-            print("REGRESSIONS (slower performance):")
-            print("-" * 80)
+            write("\n" + section_rule)
+            write("REGRESSIONS (slower performance):\n")
+            write(section_rule)
             for comp in sorted(regressions, key=lambda c: c.change_percent, reverse=True):
-                baseline_time = self.format_time(comp.baseline.mean)
-                current_time = self.format_time(comp.current.mean)
-                print(f"  ❌ {comp.name}")
-                print(f"     Baseline: {baseline_time}")
-                print(f"     Current:  {current_time}")
-                print(f"     Change:   +{comp.change_percent:.2f}% (slower)")
-                print()
+                write("  ❌ " + comp.name + "\n")
+                write("     Baseline: " + fmt(comp.baseline.mean) + "\n")
+                write("     Current:  " + fmt(comp.current.mean) + "\n")
+                write(f"     Change:   +{comp.change_percent:.2f}% (slower)\n\n")
         
         # Improvements
         if improvements:
-            print("\n" + "-" * 80)
-            print("IMPROVEMENTS (faster performance):")
-            print("-" * 80)
+            write("\n" + section_rule)
+            write("IMPROVEMENTS (faster performance):\n")
+            write(section_rule)
             for comp in sorted(improvements, key=lambda c: c.change_percent):
-                baseline_time = self.format_time(comp.baseline.mean)
-                current_time = self.format_time(comp.current.mean)
-                print(f"  ✅ {comp.name}")
-                print(f"     Baseline: {baseline_time}")
-                print(f"     Current:  {current_time}")
-                print(f"     Change:   {comp.change_percent:.2f}% (faster)")
-                print()
+                write("  ✅ " + comp.name + "\n")
+                write("     Baseline: " + fmt(comp.baseline.mean) + "\n")
+                write("     Current:  " + fmt(comp.current.mean) + "\n")
+                write(f"     Change:   {comp.change_percent:.2f}% (faster)\n\n")
         
         # New benchmarks
         if new:
-            print("\n" + "-" * 80)
-            print("NEW BENCHMARKS:")
-            print("-" * 80)
+            write("\n" + section_rule)
+            write("NEW BENCHMARKS:\n")
+            write(section_rule)
             for comp in new:
-                current_time = self.format_time(comp.current.mean)
-                print(f"  🆕 {comp.name}: {current_time}")
+                write("  🆕 " + comp.name + ": " + fmt(comp.current.mean) + "\n")
         
         # Missing benchmarks
         if missing:
-            print("\n" + "-" * 80)
-            print("MISSING BENCHMARKS:")
-            print("-" * 80)
+            write("\n" + section_rule)
+            write("MISSING BENCHMARKS:\n")
+            write(section_rule)
             for comp in missing:
-                baseline_time = self.format_time(comp.baseline.mean)
-                print(f"  ⚠️  {comp.name}: {baseline_time} (baseline)")
+                write("  ⚠️  " + comp.name + ": " + fmt(comp.baseline.mean) + " (baseline)\n")
+        
+        write("\n" + rule)
         
-        print("\n" + "=" * 80)
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
         
         return len(regressions) > 0
 
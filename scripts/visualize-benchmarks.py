@@ -10,15 +10,37 @@ Usage:
 """
 
 import argparse
-import json
+import io
+import os
 import sys
+from collections import defaultdict
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
 from dataclasses import dataclass
-from datetime import datetime
 
+from _bench_common import Estimates, decode_estimates, dump_json, format_time, load_json, parse_all
 
-@dataclass
+# datetime, tempfile and the optional orjson accelerator are
+# imported on first use so that --help and argument errors do not pay for
+# them.
+
+# Criterion output directories that sit next to base/ in a benchmark directory
+# and never contain baseline estimates
+PRUNED_DIRS = frozenset(("new", "change", "report"))
+
+# Parsed estimates cache, kept out of the report directory so that it is
+# never uploaded or restored along with the reports
+ESTIMATES_CACHE_PATH = Path(
+    os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+) / "contextune" / "benchmark-estimates.json"
+ESTIMATES_CACHE_VERSION = 1
+
+# Write buffer for streamed reports, large enough to batch many small writes
+REPORT_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(slots=True, frozen=True)
 class BenchmarkData:
     """Benchmark data point"""
     name: str
@@ -29,277 +51,232 @@ class BenchmarkData:
     unit: str = "ns"
 
 
-class BenchmarkVisualizer:
-    """Visualizes benchmark results"""
+def _iter_base_estimates(root: str) -> Iterator[str]:
+    """
+    Yield candidate base/estimates.json paths under a Criterion directory
+    
+    In a benchmark directory (one with a base/ subdirectory), Criterion's
+    sibling new/, change/ and report/ trees are pruned without being
+    listed; elsewhere those names are walked like any benchmark group.
+    Yielded files are not checked for existence.
+    
+    Args:
+        root: Directory to walk
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    
+    with it:
+        subdirs = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+    
+    is_bench_dir = any(entry.name == "base" for entry in subdirs)
+    for entry in subdirs:
+        if entry.name == "base":
+            yield os.path.join(entry.path, "estimates.json")
+        elif not (is_bench_dir and entry.name in PRUNED_DIRS):
+            yield from _iter_base_estimates(entry.path)
 
-    def __init__(self, output_dir: Path):
-        """
-        Initialize visualizer
-        
-        Args:
-            output_dir: Directory to save visualizations
-        """
-        self.output_dir = output_dir
-        self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def load_criterion_results(self, criterion_dir: Path) -> Dict[str, BenchmarkData]:
-        """
-        Load benchmark results from Criterion output directory
-        
-        Args:
-            criterion_dir: Path to criterion output directory
-            
-        Returns:
-            Dictionary mapping benchmark names to data
-        """
-        results = {}
-        timestamp = datetime.now().isoformat()
-        
-        if not criterion_dir.exists():
-            return results
-        
-        # Recursively find all estimates.json files
-        estimates_files = list(criterion_dir.rglob("estimates.json"))
-        
-        for estimates_file in estimates_files:
-            try:
-                with open(estimates_file, 'r') as f:
-                    data = json.load(f)
-                
-                mean = data.get("mean", {}).get("point_estimate", 0)
-                std_dev = data.get("std_dev", {}).get("point_estimate", 0)
-                median = data.get("median", {}).get("point_estimate", 0)
-                
-                # Construct benchmark name from path
-                # e.g., target/criterion/cpu_usage/multi_pass_processing/1000/base/estimates.json
-                # -> cpu_usage/multi_pass_processing/1000
-                rel_path = estimates_file.relative_to(criterion_dir)
-                parts = list(rel_path.parts[:-2])  # Remove 'base' and 'estimates.json'
-                
-                if not parts:
-                    continue
-                
-                bench_name = '/'.join(parts)
-                
-                # Only keep 'base' results (not 'new' or 'change')
-                if 'base' in estimates_file.parts:
-                    results[bench_name] = BenchmarkData(
-                        name=bench_name,
-                        timestamp=timestamp,
-                        mean=mean,
-                        std_dev=std_dev,
-                        median=median
-                    )
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
-                print(f"Warning: Failed to parse {estimates_file}: {e}", file=sys.stderr)
-        
-        return results
+def _parse_estimates(path: str) -> Optional[Estimates]:
+    """
+    Parse a single Criterion estimates.json file
+    
+    Args:
+        path: Path to estimates.json
+        
+    Returns:
+        (mean, std_dev, median) tuple, or None if missing or unparseable
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    
+    with f:
+        return decode_estimates(f.read(), path)
 
-    def format_time(self, nanoseconds: float) -> str:
-        """Format time in appropriate unit"""
-        if nanoseconds < 1000:
-            return f"{nanoseconds:.2f} ns"
-        elif nanoseconds < 1_000_000:
-            return f"{nanoseconds / 1000:.2f} µs"
-        elif nanoseconds < 1_000_000_000:
-            return f"{nanoseconds / 1_000_000:.2f} ms"
-        else:
-            return f"{nanoseconds / 1_000_000_000:.2f} s"
 
-    def generate_html_report(self, results: Dict[str, BenchmarkData]) -> str:
-        """
-        Generate HTML report with embedded charts
-        
-        Args:
-            results: Benchmark results
-            
-        Returns:
-            HTML content
-        """
-        # Sort benchmarks by category
-        categories = {}
-        for name, data in results.items():
-            category = name.split('/')[0] if '/' in name else 'other'
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((name, data))
-        
-        # Generate HTML
-        html = """<!DOCTYPE html>
+# Static page header and stylesheet, written verbatim
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Benchmark Results - Contexture</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             line-height: 1.6;
             color: #333;
             background: #f5f5f5;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             padding: 30px;
             border-radius: 8px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
+        }
         
-        h1 {{
+        h1 {
             color: #2c3e50;
             margin-bottom: 10px;
             font-size: 2em;
-        }}
+        }
         
-        .timestamp {{
+        .timestamp {
             color: #7f8c8d;
             margin-bottom: 30px;
             font-size: 0.9em;
-        }}
+        }
         
-        .summary {{
+        .summary {
             background: #ecf0f1;
             padding: 20px;
             border-radius: 6px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .summary h2 {{
+        .summary h2 {
             color: #34495e;
             margin-bottom: 15px;
             font-size: 1.3em;
-        }}
+        }
         
-        .stats {{
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
-        }}
+        }
         
-        .stat {{
+        .stat {
             background: white;
             padding: 15px;
             border-radius: 4px;
             border-left: 4px solid #3498db;
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             color: #7f8c8d;
             font-size: 0.85em;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .stat-value {{
+        .stat-value {
             color: #2c3e50;
             font-size: 1.8em;
             font-weight: bold;
             margin-top: 5px;
-        }}
+        }
         
-        .category {{
+        .category {
             margin-bottom: 40px;
-        }}
+        }
         
-        .category h2 {{
+        .category h2 {
             color: #2c3e50;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 2px solid #3498db;
             font-size: 1.5em;
-        }}
+        }
         
-        .benchmark-grid {{
+        .benchmark-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
             gap: 20px;
-        }}
+        }
         
-        .benchmark-card {{
+        .benchmark-card {
             background: #f8f9fa;
             padding: 20px;
             border-radius: 6px;
             border: 1px solid #e1e4e8;
             transition: transform 0.2s, box-shadow 0.2s;
-        }}
+        }
         
-        .benchmark-card:hover {{
+        .benchmark-card:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .benchmark-name {{
+        .benchmark-name {
             font-weight: 600;
             color: #2c3e50;
             margin-bottom: 15px;
             font-size: 1.1em;
             word-break: break-word;
-        }}
+        }
         
-        .benchmark-metrics {{
+        .benchmark-metrics {
             display: flex;
             flex-direction: column;
             gap: 8px;
-        }}
+        }
         
-        .metric {{
+        .metric {
             display: flex;
             justify-content: space-between;
             align-items: center;
             padding: 8px;
             background: white;
             border-radius: 4px;
-        }}
+        }
         
-        .metric-label {{
+        .metric-label {
             color: #7f8c8d;
             font-size: 0.9em;
-        }}
+        }
         
-        .metric-value {{
+        .metric-value {
             color: #2c3e50;
             font-weight: 600;
             font-family: 'Courier New', monospace;
-        }}
+        }
         
-        .footer {{
+        .footer {
             margin-top: 40px;
             padding-top: 20px;
             border-top: 1px solid #e1e4e8;
             text-align: center;
             color: #7f8c8d;
             font-size: 0.9em;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .container {{
+        @media (max-width: 768px) {
+            .container {
                 padding: 20px;
-            }}
+            }
             
-            .benchmark-grid {{
+            .benchmark-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .stats {{
+            .stats {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <h1>🎵 Contexture Benchmark Results</h1>
-        <div class="timestamp">Generated: {timestamp}</div>
+"""
+
+# Generation timestamp and summary section, filled via str.format
+_HTML_SUMMARY_TEMPLATE = """        <div class="timestamp">Generated: {timestamp}</div>
         
         <div class="summary">
             <h2>Summary</h2>
@@ -323,57 +300,42 @@ class BenchmarkVisualizer:
             </div>
         </div>
 """
-        
-        # Calculate summary stats
-        all_times = [data.mean for data in results.values()]
-        fastest_time = self.format_time(min(all_times)) if all_times else "N/A"
-        slowest_time = self.format_time(max(all_times)) if all_times else "N/A"
-        
-        html = html.format(
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            total_benchmarks=len(results),
-            total_categories=len(categories),
-            fastest_time=fastest_time,
-            slowest_time=slowest_time
-        )
-        
-        # Add categories
-        for category, benchmarks in sorted(categories.items()):
-            html += f"""
+
+# Opening and closing markup for each category section
+_HTML_CATEGORY_TEMPLATE = """
         <div class="category">
-            <h2>{category.replace('_', ' ').title()}</h2>
+            <h2>{title}</h2>
             <div class="benchmark-grid">
 """
-            
-            for name, data in sorted(benchmarks):
-                display_name = name.split('/')[-1] if '/' in name else name
-                html += f"""
+
+_HTML_CATEGORY_END = """
+            </div>
+        </div>
+"""
+
+# Markup for a single benchmark card, filled via str.format_map
+_HTML_CARD_TEMPLATE = """
                 <div class="benchmark-card">
                     <div class="benchmark-name">{display_name}</div>
                     <div class="benchmark-metrics">
                         <div class="metric">
                             <span class="metric-label">Mean</span>
-                            <span class="metric-value">{self.format_time(data.mean)}</span>
+                            <span class="metric-value">{mean}</span>
                         </div>
                         <div class="metric">
                             <span class="metric-label">Median</span>
-                            <span class="metric-value">{self.format_time(data.median)}</span>
+                            <span class="metric-value">{median}</span>
                         </div>
                         <div class="metric">
                             <span class="metric-label">Std Dev</span>
-                            <span class="metric-value">{self.format_time(data.std_dev)}</span>
+                            <span class="metric-value">{std_dev}</span>
                         </div>
                     </div>
                 </div>
 """
-            
-            html += """
-            </div>
-        </div>
-"""
-        
-        # Footer
-        html += """
+
+# Page footer, written verbatim
+_HTML_FOOTER = """
         <div class="footer">
             <p>Generated by Contexture Benchmark Visualizer</p>
             <p>Powered by Criterion.rs</p>
@@ -382,8 +344,327 @@ class BenchmarkVisualizer:
 </body>
 </html>
 """
+
+
+class BenchmarkVisualizer:
+    """Visualizes benchmark results"""
+
+    def __init__(self, output_dir: Path):
+        """
+        Initialize visualizer
         
-        return html
+        Args:
+            output_dir: Directory to save visualizations
+        """
+        self.output_dir = output_dir
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_path = ESTIMATES_CACHE_PATH
+
+    def load_criterion_results(self, criterion_dir: Path) -> Dict[str, BenchmarkData]:
+        """
+        Load benchmark results from Criterion output directory
+        
+        Args:
+            criterion_dir: Path to criterion output directory
+            
+        Returns:
+            Dictionary mapping benchmark names to data
+        """
+        from datetime import datetime
+        
+        results = {}
+        timestamp = datetime.now().isoformat()
+        
+        if not criterion_dir.exists():
+            return results
+        
+        # Find base/estimates.json files, skipping Criterion's own new/, change/ and report/
+        bench_names = []
+        estimates_files = []
+        for estimates_file in _iter_base_estimates(str(criterion_dir)):
+            # Construct benchmark name from path
+            # e.g., target/criterion/cpu_usage/multi_pass_processing/1000/base/estimates.json
+            # -> cpu_usage/multi_pass_processing/1000
+            bench_dir = os.path.dirname(os.path.dirname(estimates_file))
+            rel_path = os.path.relpath(bench_dir, criterion_dir)
+            
+            if rel_path == os.curdir:
+                continue
+            
+            bench_names.append(sys.intern(rel_path.replace(os.sep, '/')))
+            estimates_files.append(estimates_file)
+        
+        for bench_name, estimates in zip(bench_names, self._load_estimates(criterion_dir, estimates_files)):
+            if estimates is None:
+                continue
+            
+            mean, std_dev, median = estimates
+            results[bench_name] = BenchmarkData(
+                name=bench_name,
+                timestamp=timestamp,
+                mean=mean,
+                std_dev=std_dev,
+                median=median
+            )
+        
+        return results
+
+    def _load_estimates(
+        self,
+        criterion_dir: Path,
+        estimates_files: List[str]
+    ) -> List[Optional[Estimates]]:
+        """
+        Parse estimates files, reusing cached values for unchanged files
+        
+        Files are keyed by absolute path and considered unchanged while their
+        (mtime_ns, size) matches the cached entry, so repeat runs only
+        re-parse benchmarks that Criterion has rewritten. The cache is shared
+        between Criterion directories: entries for other directories are
+        kept, and only entries under criterion_dir whose files are gone are
+        dropped. It is rewritten only when an entry changed.
+        
+        Args:
+            criterion_dir: Criterion directory the files were found in
+            estimates_files: Paths to estimates.json files
+            
+        Returns:
+            Parsed (mean, std_dev, median) tuples aligned with estimates_files
+        """
+        cache = self._load_cache()
+        estimates = [None] * len(estimates_files)
+        stamps = [None] * len(estimates_files)
+        stale = []
+        changed = False
+        
+        cache_keys = [os.path.abspath(estimates_file) for estimates_file in estimates_files]
+        
+        for i, estimates_file in enumerate(estimates_files):
+            try:
+                st = os.stat(estimates_file)
+            except OSError:
+                continue
+            
+            stamps[i] = (st.st_mtime_ns, st.st_size)
+            cached = cache.get(cache_keys[i])
+            if cached is not None and cached[:2] == stamps[i]:
+                estimates[i] = cached[2]
+            else:
+                stale.append(i)
+        
+        parsed = parse_all(_parse_estimates, [estimates_files[i] for i in stale])
+        for i, value in zip(stale, parsed):
+            estimates[i] = value
+            if value is not None:
+                cache[cache_keys[i]] = stamps[i] + (value,)
+                changed = True
+            elif cache.pop(cache_keys[i], None) is not None:
+                changed = True
+        
+        # Forget files under this directory that no longer exist
+        root = os.path.join(os.path.abspath(criterion_dir), "")
+        for cache_key in [key for key in cache if key.startswith(root)]:
+            if not os.path.exists(cache_key):
+                del cache[cache_key]
+                changed = True
+        
+        if changed:
+            self._save_cache(cache)
+        
+        return estimates
+
+    def _load_cache(self) -> Dict[str, Tuple[int, int, Estimates]]:
+        """
+        Load the parsed estimates cache, or an empty one if unreadable
+        
+        Malformed entries are dropped, so a damaged cache only costs a
+        re-parse of the affected files.
+        """
+        try:
+            with open(self._cache_path, 'rb') as f:
+                data = load_json(f.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring estimates cache {self._cache_path}: {e}", file=sys.stderr)
+            return {}
+        
+        if not isinstance(data, dict) or data.get("version") != ESTIMATES_CACHE_VERSION:
+            return {}
+        
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        
+        cache = {}
+        for path, entry in entries.items():
+            try:
+                mtime_ns, size, (mean, std_dev, median) = entry
+            except (TypeError, ValueError):
+                continue
+            
+            if type(mtime_ns) is not int or type(size) is not int:
+                continue
+            if not all(type(v) in (int, float) for v in (mean, std_dev, median)):
+                continue
+            
+            cache[path] = (mtime_ns, size, (float(mean), float(std_dev), float(median)))
+        
+        return cache
+
+    def _save_cache(self, cache: Dict[str, Tuple[int, int, Estimates]]) -> None:
+        """Persist the parsed estimates cache atomically"""
+        import tempfile
+        
+        buf = dump_json({"version": ESTIMATES_CACHE_VERSION, "entries": cache})
+        tmp_path = None
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self._cache_path.parent,
+                prefix=self._cache_path.name + ".",
+                delete=False
+            ) as f:
+                tmp_path = f.name
+                f.write(buf)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            print(f"Warning: Failed to write estimates cache {self._cache_path}: {e}", file=sys.stderr)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def format_time(self, nanoseconds: float) -> str:
+        """Format time in appropriate unit"""
+        return format_time(nanoseconds)
+
+    def _group_by_category(
+        self,
+        results: Dict[str, BenchmarkData]
+    ) -> Dict[str, List[Tuple[str, str, BenchmarkData]]]:
+        """
+        Group benchmarks by the first component of their name
+        
+        Args:
+            results: Benchmark results
+            
+        Returns:
+            Dictionary mapping category to (name, display_name, data) tuples
+        """
+        categories = defaultdict(list)
+        for name, data in results.items():
+            category, sep, _ = name.partition('/')
+            if not sep:
+                category = 'other'
+            categories[category].append((name, name.rpartition('/')[2], data))
+        
+        return categories
+
+    def _prepare_sorted_categories(
+        self,
+        results: Dict[str, BenchmarkData]
+    ) -> List[Tuple[str, List[Tuple[str, str, BenchmarkData]]]]:
+        """
+        Group benchmarks by category, sorted by category and benchmark name
+        
+        Callers producing several report formats compute this once and pass
+        it to each write_*/save_* method.
+        
+        Args:
+            results: Benchmark results
+            
+        Returns:
+            List of (category, [(name, display_name, data), ...]) pairs
+        """
+        # Sort on the name only; never fall through to comparing data
+        by_name = itemgetter(0)
+        grouped = self._group_by_category(results)
+        return [
+            (category, sorted(grouped[category], key=by_name))
+            for category in sorted(grouped)
+        ]
+
+    def generate_html_report(self, results: Dict[str, BenchmarkData]) -> str:
+        """
+        Generate HTML report with embedded charts
+        
+        Args:
+            results: Benchmark results
+            
+        Returns:
+            HTML content
+        """
+        buf = io.StringIO()
+        self.write_html_report(results, self._prepare_sorted_categories(results), buf)
+        return buf.getvalue()
+
+    def write_html_report(
+        self,
+        results: Dict[str, BenchmarkData],
+        categories: List[Tuple[str, List[Tuple[str, str, BenchmarkData]]]],
+        fh: TextIO
+    ) -> None:
+        """
+        Write HTML report with embedded charts to an open file
+        
+        Args:
+            results: Benchmark results
+            categories: Output of _prepare_sorted_categories(results)
+            fh: Text stream to write the report to
+        """
+        from datetime import datetime
+        
+        # Calculate summary stats
+        all_times = [data.mean for data in results.values()]
+        fastest_time = self.format_time(min(all_times)) if all_times else "N/A"
+        slowest_time = self.format_time(max(all_times)) if all_times else "N/A"
+        
+        write = fh.write
+        write(_HTML_HEAD)
+        write(_HTML_SUMMARY_TEMPLATE.format(
+            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            total_benchmarks=len(results),
+            total_categories=len(categories),
+            fastest_time=fastest_time,
+            slowest_time=slowest_time
+        ))
+        
+        # Add categories
+        fmt = self.format_time
+        for category, benchmarks in categories:
+            write(_HTML_CATEGORY_TEMPLATE.format(title=category.replace('_', ' ').title()))
+            
+            for _, display_name, data in benchmarks:
+                write(_HTML_CARD_TEMPLATE.format_map({
+                    'display_name': display_name,
+                    'mean': fmt(data.mean),
+                    'median': fmt(data.median),
+                    'std_dev': fmt(data.std_dev),
+                }))
+            
+            write(_HTML_CATEGORY_END)
+        
+        # Footer
+        write(_HTML_FOOTER)
+
+    def save_html_report(
+        self,
+        results: Dict[str, BenchmarkData],
+        categories: List[Tuple[str, List[Tuple[str, str, BenchmarkData]]]],
+        html_file: Path
+    ) -> None:
+        """
+        Write HTML report to a file
+        
+        Args:
+            results: Benchmark results
+            categories: Output of _prepare_sorted_categories(results)
+            html_file: Destination path
+        """
+        with open(html_file, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+            self.write_html_report(results, categories, f)
 
     def generate_markdown_report(self, results: Dict[str, BenchmarkData]) -> str:
         """
@@ -395,15 +676,28 @@ class BenchmarkVisualizer:
         Returns:
             Markdown content
         """
-        # Sort benchmarks by category
-        categories = {}
-        for name, data in results.items():
-            category = name.split('/')[0] if '/' in name else 'other'
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((name, data))
+        buf = io.StringIO()
+        self.write_markdown_report(results, self._prepare_sorted_categories(results), buf)
+        return buf.getvalue()
+
+    def write_markdown_report(
+        self,
+        results: Dict[str, BenchmarkData],
+        categories: List[Tuple[str, List[Tuple[str, str, BenchmarkData]]]],
+        fh: TextIO
+    ) -> None:
+        """
+        Write Markdown report to an open file
         
-        md = f"""# Benchmark Results
+        Args:
+            results: Benchmark results
+            categories: Output of _prepare_sorted_categories(results)
+            fh: Text stream to write the report to
+        """
+        from datetime import datetime
+        
+        write = fh.write
+        write(f"""# Benchmark Results
 
 **Generated:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -412,28 +706,49 @@ class BenchmarkVisualizer:
 - **Total Benchmarks:** {len(results)}
 - **Categories:** {len(categories)}
 
-"""
+""")
         
         # Add categories
-        for category, benchmarks in sorted(categories.items()):
-            md += f"\n## {category.replace('_', ' ').title()}\n\n"
-            md += "| Benchmark | Mean | Median | Std Dev |\n"
-            md += "|-----------|------|--------|----------|\n"
+        fmt = self.format_time
+        for category, benchmarks in categories:
+            write(f"\n## {category.replace('_', ' ').title()}\n\n")
+            write("| Benchmark | Mean | Median | Std Dev |\n")
+            write("|-----------|------|--------|----------|\n")
             
-            for name, data in sorted(benchmarks):
-                display_name = name.split('/')[-1] if '/' in name else name
-                md += f"| {display_name} | {self.format_time(data.mean)} | "
-                md += f"{self.format_time(data.median)} | {self.format_time(data.std_dev)} |\n"
+            for _, display_name, data in benchmarks:
+                write(f"| {display_name} | {fmt(data.mean)} | ")
+                write(f"{fmt(data.median)} | {fmt(data.std_dev)} |\n")
+
+    def save_markdown_report(
+        self,
+        results: Dict[str, BenchmarkData],
+        categories: List[Tuple[str, List[Tuple[str, str, BenchmarkData]]]],
+        md_file: Path
+    ) -> None:
+        """
+        Write Markdown report to a file
         
-        return md
+        Args:
+            results: Benchmark results
+            categories: Output of _prepare_sorted_categories(results)
+            md_file: Destination path
+        """
+        with open(md_file, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+            self.write_markdown_report(results, categories, f)
 
-    def save_results_json(self, results: Dict[str, BenchmarkData]) -> None:
+    def save_results_json(self, results: Dict[str, BenchmarkData]) -> List[str]:
         """
         Save results as JSON for historical tracking
         
         Args:
             results: Benchmark results
+            
+        Returns:
+            Progress messages for the caller to print, since this may run on
+            a worker thread
         """
+        from datetime import datetime
+        
         output_file = self.output_dir / "latest.json"
         
         data = {
@@ -449,17 +764,32 @@ class BenchmarkVisualizer:
             }
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Serialize once and reuse the bytes for both files
+        buf = dump_json(data)
+        output_file.write_bytes(buf)
         
-        print(f"Saved JSON results to {output_file}")
+        messages = [f"Saved JSON results to {output_file}"]
         
-        # Also append to history
+        # Also append to history with a single O_APPEND write, so concurrent
+        # CI jobs cannot interleave partial lines
         history_file = self.output_dir / "history.jsonl"
-        with open(history_file, 'a') as f:
-            f.write(json.dumps(data) + '\n')
-        
-        print(f"Appended to history: {history_file}")
+        line = buf + b'\n'
+        fd = os.open(history_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            written = os.write(fd, line)
+        finally:
+            os.close(fd)
+        
+        # Retrying the remainder could interleave with another writer, so a
+        # short write is an error rather than something to resume
+        if written != len(line):
+            raise OSError(
+                f"Short write to {history_file}: {written} of {len(line)} bytes, "
+                "history may contain a truncated entry"
+            )
+        
+        messages.append(f"Appended to history: {history_file}")
+        return messages
 
 
 def main():
@@ -506,27 +836,35 @@ def main():
     
     print(f"Loaded {len(results)} benchmarks")
     
-    # Generate reports
+    # Generate reports; formats are independent, so emit them concurrently
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Group and sort once for every report format
+    categories = visualizer._prepare_sorted_categories(results)
+    
+    tasks = []
     if args.format in ["html", "all"]:
         print("Generating HTML report...")
-        html = visualizer.generate_html_report(results)
         html_file = args.output / "index.html"
-        with open(html_file, 'w') as f:
-            f.write(html)
-        print(f"✅ HTML report: {html_file}")
+        tasks.append((visualizer.save_html_report, (results, categories, html_file), f"✅ HTML report: {html_file}"))
     
     if args.format in ["markdown", "all"]:
         print("Generating Markdown report...")
-        md = visualizer.generate_markdown_report(results)
         md_file = args.output / "report.md"
-        with open(md_file, 'w') as f:
-            f.write(md)
-        print(f"✅ Markdown report: {md_file}")
+        tasks.append((visualizer.save_markdown_report, (results, categories, md_file), f"✅ Markdown report: {md_file}"))
     
     if args.format in ["json", "all"]:
         print("Saving JSON results...")
-        visualizer.save_results_json(results)
-        print(f"✅ JSON results: {args.output / 'latest.json'}")
+        tasks.append((visualizer.save_results_json, (results,), f"✅ JSON results: {args.output / 'latest.json'}"))
+    
+    # Tasks return their progress messages (if any) instead of printing, so
+    # all output comes from this thread and lines cannot interleave
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [(executor.submit(func, *func_args), message) for func, func_args, message in tasks]
+        for future, message in futures:
+            for line in future.result() or ():
+                print(line)
+            print(message)
     
     print(f"\n✅ All reports generated in {args.output}")
 